@@ -1,7 +1,37 @@
 #!/usr/bin/env python3
-import json
 from datetime import datetime
-from ripio_api_utils import make_request, get_api_credentials
+from ripio_api_utils import bind_endpoint, get_api_credentials, format_json
+
+# Request function bound once to the balances endpoint
+fetch_balances = bind_endpoint("GET", "/user/balances/")
+
+def display_balances(balances):
+    """Display account balances in a table.
+    
+    Args:
+        balances: List of balance objects from the API response
+    """
+    print("\n===== RIPIO ACCOUNT BALANCES =====")
+    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=================================")
+    
+    if not balances:
+        print("No balances found.")
+        return
+    
+    # Format as a table
+    print(f"{'Currency':<10} {'Available':<15} {'Locked':<15} {'Last Update':<25}")
+    print("-" * 65)
+    
+    for balance in balances:
+        currency = balance.get('currency_code', 'N/A')
+        available = float(balance.get('available_amount', 0))
+        locked = float(balance.get('locked_amount', 0))
+        last_update = balance.get('last_update', 'N/A')
+        
+        print(f"{currency:<10} {available:<15.8f} {locked:<15.8f} {last_update:<25}")
+    
+    print("=================================")
 
 def main():
     """Get account balances from Ripio Trade API."""
@@ -11,43 +41,18 @@ def main():
     if not api_key or not api_secret:
         return
     
-    # API endpoint for fetching balances
-    endpoint = "/user/balances/"
-    
-    # Make the request using the utility function
-    response = make_request(api_key, api_secret, "GET", endpoint)
+    # Make the request using the bound endpoint
+    response = fetch_balances(api_key, api_secret)
     
     if not response:
         return
     
     # Parse the response
     if 'data' in response:
-        balances = response['data']
-        
-        # Print balances
-        print("\n===== RIPIO ACCOUNT BALANCES =====")
-        print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=================================")
-        
-        if not balances:
-            print("No balances found.")
-        else:
-            # Format as a table
-            print(f"{'Currency':<10} {'Available':<15} {'Locked':<15} {'Last Update':<25}")
-            print("-" * 65)
-            
-            for balance in balances:
-                currency = balance.get('currency_code', 'N/A')
-                available = float(balance.get('available_amount', 0))
-                locked = float(balance.get('locked_amount', 0))
-                last_update = balance.get('last_update', 'N/A')
-                
-                print(f"{currency:<10} {available:<15.8f} {locked:<15.8f} {last_update:<25}")
-            
-            print("=================================")
+        display_balances(response['data'])
     else:
         print("Unexpected response format:")
-        print(json.dumps(response, indent=2))
+        print(format_json(response))
 
 if __name__ == "__main__":
     main()
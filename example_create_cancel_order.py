@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
+import asyncio
 import time
-import json
 from datetime import datetime
-from ripio_api_utils import make_request, get_api_credentials
+from ripio_api_utils import make_request_async, get_api_credentials, encode_json
+from example_user_orders import get_user_orders
 
-def create_order(api_key, api_secret, pair, side, order_type, amount, price, 
+async def create_order(api_key, api_secret, pair, side, order_type, amount, price, 
                  external_id=None, post_only=False, immediate_or_cancel=False, 
                  fill_or_kill=False, expiration=None):
     """Create a new order on Ripio Trade.
@@ -38,22 +39,22 @@ def create_order(api_key, api_secret, pair, side, order_type, amount, price,
     }
     
     # Add optional parameters if provided
-    if external_id:
-        order_data["external_id"] = external_id
-    if post_only:
-        order_data["post_only"] = True
-    if immediate_or_cancel:
-        order_data["immediate_or_cancel"] = True
-    if fill_or_kill:
-        order_data["fill_or_kill"] = True
-    if expiration:
-        order_data["expiration"] = expiration
+    order_data.update({key: value for key, value in (
+        ("external_id", external_id),
+        ("post_only", post_only),
+        ("immediate_or_cancel", immediate_or_cancel),
+        ("fill_or_kill", fill_or_kill),
+        ("expiration", expiration),
+    ) if value})
     
     print(f"\nCreating {order_type} {side} order for {pair}...")
     print(f"Amount: {amount}, Price: {price}")
     
+    # Encode the finished order once; make_request signs and sends these bytes as-is
+    order_body = encode_json(order_data)
+    
     # Make the request using the utility function
-    response = make_request(api_key, api_secret, "POST", endpoint, data=order_data)
+    response = await make_request_async(api_key, api_secret, "POST", endpoint, body=order_body)
     
     if response:
         print("Order created successfully!")
@@ -62,7 +63,7 @@ def create_order(api_key, api_secret, pair, side, order_type, amount, price,
         
     return response
 
-def cancel_order(api_key, api_secret, order_id):
+async def cancel_order(api_key, api_secret, order_id):
     """Cancel an existing order on Ripio Trade.
     
     Args:
@@ -75,15 +76,13 @@ def cancel_order(api_key, api_secret, order_id):
     """
     endpoint = "/orders"
     
-    # Prepare cancel data
-    cancel_data = {
-        "id": order_id
-    }
+    # Prepare cancel data, encoded up front since its shape is fixed
+    cancel_body = encode_json({"id": order_id})
     
     print(f"\nCanceling order with ID: {order_id}...")
     
     # Make the request using the utility function
-    response = make_request(api_key, api_secret, "DELETE", endpoint, data=cancel_data)
+    response = await make_request_async(api_key, api_secret, "DELETE", endpoint, body=cancel_body)
     
     if response:
         print("Order canceled successfully!")
@@ -92,7 +91,7 @@ def cancel_order(api_key, api_secret, order_id):
         
     return response
 
-def test_create_and_cancel_order():
+async def test_create_and_cancel_order():
     """Test creating and canceling an order on Ripio Trade."""
     # Get API credentials from environment variables
     api_key, api_secret = get_api_credentials()
@@ -112,7 +111,7 @@ def test_create_and_cancel_order():
     price = 1200  # At 1200 ARS per USDC
     
     # Create the order
-    create_response = create_order(
+    create_response = await create_order(
         api_key, 
         api_secret, 
         pair, 
@@ -147,17 +146,38 @@ def test_create_and_cancel_order():
     print(f"Status: {order_data.get('status')}")
     print("--------------------------------")
     
+    # Verify the order is on the book while we wait, so the check adds no wall time
+    verify_task = asyncio.create_task(
+        get_user_orders(api_key, api_secret, status="open", pair=pair)
+    )
+    
     # Wait a moment before canceling
     print("\nWaiting 2 seconds before canceling...")
-    time.sleep(2)
+    await asyncio.sleep(2)
     
     # Cancel the order
-    cancel_response = cancel_order(api_key, api_secret, order_id)
+    cancel_response, open_orders = await asyncio.gather(
+        cancel_order(api_key, api_secret, order_id),
+        verify_task
+    )
     
     if not cancel_response or 'data' not in cancel_response:
         print("Test failed: Could not cancel order")
         return False
     
+    if not open_orders:
+        print("Test failed: Could not verify open orders")
+        return False
+    
+    open_order_ids = [
+        order.get('id') for order in (open_orders.get('data') or {}).get('orders', [])
+    ]
+    if order_id not in open_order_ids:
+        print("Test failed: Created order was not found among open orders")
+        return False
+    
+    print(f"\nVerified order {order_id} was listed among open orders")
+    
     # Extract cancellation details
     cancel_data = cancel_response['data']
     
@@ -172,7 +192,7 @@ def test_create_and_cancel_order():
 
 if __name__ == "__main__":
     print("Testing Ripio Trade order creation and cancellation...")
-    success = test_create_and_cancel_order()
+    success = asyncio.run(test_create_and_cancel_order())
     
     if success:
         print("\nTest completed successfully!")
@@ -1,30 +1,47 @@
 #!/usr/bin/env python3
-import json
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from ripio_api_utils import make_request, get_api_credentials
+from itertools import accumulate
+from ripio_api_utils import make_request, make_requests_parallel, get_api_credentials
 
-def get_order_book_level2(api_key, api_secret, pair, limit=None, aggregation=None):
-    """Get order book level 2 data from Ripio Trade API.
+ORDER_BOOK_ENDPOINT = "/book/orders/level-2"
+
+# Row template for the bid/ask tables, applied with %-formatting so the
+# column spec is not re-parsed for every level
+BOOK_ROW = "%-15s %-15s %-10s".__mod__
+
+def order_book_params(pair, limit=None, aggregation=None):
+    """Build the query parameters for an order book level 2 request.
     
     Args:
-        api_key: API key
-        api_secret: API secret
         pair: Currency pair code (e.g., 'BTCUSD')
         limit: Optional limit for number of orders to return
         aggregation: Optional price aggregation level
         
     Returns:
-        dict: API response with order book data
+        dict: Query parameters
     """
-    endpoint = "/book/orders/level-2"
-    
-    # Add query parameters
     params = {'pair': pair}
     if limit:
         params['limit'] = limit
     if aggregation:
         params['aggregation'] = aggregation
+    return params
+
+def get_order_book_level2(api_key, api_secret, pair, limit=None, aggregation=None):
+    """Get order book level 2 data from Ripio Trade API.
     
+    Args:
+        api_key: API key
+        api_secret: API secret
+        pair: Currency pair code (e.g., 'BTCUSD')
+        limit: Optional limit for number of orders to return
+        aggregation: Optional price aggregation level
+        
+    Returns:
+        dict: API response with order book data
+    """
     print(f"\nGetting order book level 2 data for {pair}...")
     if limit:
         print(f"Limit: {limit}")
@@ -32,7 +49,108 @@ def get_order_book_level2(api_key, api_secret, pair, limit=None, aggregation=Non
         print(f"Aggregation: {aggregation}")
     
     # Make the request using the utility function
-    return make_request(api_key, api_secret, "GET", endpoint, params=params)
+    return make_request(api_key, api_secret, "GET", ORDER_BOOK_ENDPOINT,
+                        params=order_book_params(pair, limit, aggregation))
+
+def get_order_books_level2(api_key, api_secret, pairs, limit=None, aggregation=None):
+    """Get order book level 2 data for several pairs concurrently.
+    
+    Args:
+        api_key: API key
+        api_secret: API secret
+        pairs: Currency pair codes (e.g., ['BTC_USDC', 'USDC_ARS'])
+        limit: Optional limit for number of orders to return
+        aggregation: Optional price aggregation level
+        
+    Returns:
+        list: API responses with order book data, in the same order as pairs
+    """
+    print(f"\nGetting order book level 2 data for {', '.join(pairs)}...")
+    
+    return make_requests_parallel(api_key, api_secret, [
+        ("GET", ORDER_BOOK_ENDPOINT, order_book_params(pair, limit, aggregation))
+        for pair in pairs
+    ])
+
+def parse_book_side(levels):
+    """Convert the prices and amounts of one side of the order book into
+    packed numeric arrays.
+    
+    Args:
+        levels: List of price levels ({'price', 'amount', 'count'}) from the API
+        
+    Returns:
+        tuple: (prices, amounts) as array('d'), array('d')
+    """
+    prices = array('d', (float(level['price']) for level in levels))
+    amounts = array('d', (float(level['amount']) for level in levels))
+    return prices, amounts
+
+class BookSnapshot:
+    """Price-sorted numeric view of an order book for fast lookups.
+    
+    Each side is kept in ascending price order together with a running total
+    of amounts, so price lookups are a binary search and depth queries are a
+    single subtraction instead of a scan over the levels.
+    """
+    
+    def __init__(self, bids, asks):
+        """Build the snapshot from the 'bids' and 'asks' lists of an API response."""
+        self.bid_prices, self.bid_totals = self._sort_side(bids)
+        self.ask_prices, self.ask_totals = self._sort_side(asks)
+    
+    @staticmethod
+    def _sort_side(levels):
+        prices, amounts = parse_book_side(levels)
+        order = sorted(range(len(prices)), key=prices.__getitem__)
+        sorted_prices = array('d', (prices[i] for i in order))
+        # totals[i] is the amount resting on the i cheapest levels
+        totals = array('d', [0.0])
+        totals.extend(accumulate(amounts[i] for i in order))
+        return sorted_prices, totals
+    
+    def best_bid(self):
+        """Highest bid price, or None if there are no bids."""
+        return self.bid_prices[-1] if self.bid_prices else None
+    
+    def best_ask(self):
+        """Lowest ask price, or None if there are no asks."""
+        return self.ask_prices[0] if self.ask_prices else None
+    
+    def mid_price(self):
+        """Midpoint between best bid and best ask, or None if a side is empty."""
+        if not self.bid_prices or not self.ask_prices:
+            return None
+        return (self.best_bid() + self.best_ask()) / 2
+    
+    def spread(self):
+        """Best ask minus best bid, or None if a side is empty."""
+        if not self.bid_prices or not self.ask_prices:
+            return None
+        return self.best_ask() - self.best_bid()
+    
+    def bid_depth(self, price=None):
+        """Total amount bid at or above price (the whole side if price is None)."""
+        if price is None:
+            return self.bid_totals[-1]
+        return self.bid_totals[-1] - self.bid_totals[bisect_left(self.bid_prices, price)]
+    
+    def ask_depth(self, price=None):
+        """Total amount offered at or below price (the whole side if price is None)."""
+        if price is None:
+            return self.ask_totals[-1]
+        return self.ask_totals[bisect_right(self.ask_prices, price)]
+    
+    def top_depth(self, levels):
+        """Amounts resting on the best `levels` price levels of each side.
+        
+        Returns:
+            tuple: (bid amount, ask amount)
+        """
+        bid_count = min(levels, len(self.bid_prices))
+        ask_count = min(levels, len(self.ask_prices))
+        bid_amount = self.bid_totals[-1] - self.bid_totals[len(self.bid_prices) - bid_count]
+        return bid_amount, self.ask_totals[ask_count]
 
 def display_order_book(order_book_data):
     """Display order book data in a readable format.
@@ -54,39 +172,49 @@ def display_order_book(order_book_data):
     pair = data.get('pair', 'Unknown')
     timestamp = data.get('timestamp', 'Unknown')
     
-    print("\n===== ORDER BOOK LEVEL 2 =====")
-    print(f"Pair: {pair}")
-    print(f"Timestamp: {timestamp}")
-    print(f"Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("==============================")
+    # Build the whole report first and write it with a single print call
+    lines = [
+        "\n===== ORDER BOOK LEVEL 2 =====",
+        f"Pair: {pair}",
+        f"Timestamp: {timestamp}",
+        f"Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "==============================",
+    ]
     
-    # Display bids
-    print("\n----- BIDS (Buy Orders) -----")
-    if not bids:
-        print("No bids found")
-    else:
-        print(f"{'Price':<15} {'Amount':<15} {'Count':<10}")
-        print("-" * 40)
-        for bid in bids:
-            price = bid.get('price', 'N/A')
-            amount = bid.get('amount', 'N/A')
-            count = bid.get('count', 'N/A')
-            print(f"{price:<15} {amount:<15} {count:<10}")
-    
-    # Display asks
-    print("\n----- ASKS (Sell Orders) -----")
-    if not asks:
-        print("No asks found")
-    else:
-        print(f"{'Price':<15} {'Amount':<15} {'Count':<10}")
-        print("-" * 40)
-        for ask in asks:
-            price = ask.get('price', 'N/A')
-            amount = ask.get('amount', 'N/A')
-            count = ask.get('count', 'N/A')
-            print(f"{price:<15} {amount:<15} {count:<10}")
-    
-    print("\n==============================")
+    # Display bids, then asks
+    for title, levels, empty_message in (
+        ("BIDS (Buy Orders)", bids, "No bids found"),
+        ("ASKS (Sell Orders)", asks, "No asks found"),
+    ):
+        lines.append(f"\n----- {title} -----")
+        if not levels:
+            lines.append(empty_message)
+            continue
+        
+        lines.append(BOOK_ROW(('Price', 'Amount', 'Count')))
+        lines.append("-" * 40)
+        lines.extend(
+            BOOK_ROW((level.get('price', 'N/A'), level.get('amount', 'N/A'), level.get('count', 'N/A')))
+            for level in levels
+        )
+    
+    # Summarize the top of the book from the sorted snapshot
+    try:
+        snapshot = BookSnapshot(bids, asks)
+    except (KeyError, TypeError, ValueError):
+        snapshot = None
+    
+    if snapshot and snapshot.mid_price() is not None:
+        lines.append("\n----- SUMMARY -----")
+        lines.append(f"Best bid: {snapshot.best_bid()}")
+        lines.append(f"Best ask: {snapshot.best_ask()}")
+        lines.append(f"Mid price: {snapshot.mid_price()}")
+        lines.append(f"Spread: {snapshot.spread()}")
+        lines.append(f"Bid depth: {snapshot.bid_depth()}")
+        lines.append(f"Ask depth: {snapshot.ask_depth()}")
+    
+    lines.append("\n==============================")
+    print("\n".join(lines))
 
 def test_order_book_level2():
     """Test getting order book level 2 data from Ripio Trade API."""
@@ -100,19 +228,20 @@ def test_order_book_level2():
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("======================================")
     
-    # Get order book data for BTC/USDC pair
-    pair = "BTC_USDC"  # Bitcoin/USDC
+    # Get order book data for several pairs in one concurrent batch
+    pairs = ["BTC_USDC", "USDC_ARS"]  # Bitcoin/USDC and USDC/Argentine Peso
     limit = 10  # Get top 10 orders on each side
     
     # Get the order book data
-    order_book_data = get_order_book_level2(api_key, api_secret, pair, limit)
+    order_books = get_order_books_level2(api_key, api_secret, pairs, limit)
     
-    if not order_book_data:
-        print("Test failed: Could not retrieve order book data")
-        return False
-    
-    # Display the order book data
-    display_order_book(order_book_data)
+    for pair, order_book_data in zip(pairs, order_books):
+        if not order_book_data:
+            print(f"Test failed: Could not retrieve order book data for {pair}")
+            return False
+        
+        # Display the order book data
+        display_order_book(order_book_data)
     
     print("\nTest completed successfully!")
     return True
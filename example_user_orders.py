@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
-import json
+import asyncio
 from datetime import datetime
-from ripio_api_utils import make_request, get_api_credentials
+from ripio_api_utils import make_request_async, get_api_credentials, format_json, DEBUG
 
-def get_user_orders(api_key, api_secret, status=None, pair=None, side=None, 
+async def get_user_orders(api_key, api_secret, status=None, pair=None, side=None, 
                    order_type=None, start_time=None, end_time=None, limit=None, 
                    offset=None):
     """Get user orders from Ripio Trade API with optional filters.
@@ -25,24 +25,17 @@ def get_user_orders(api_key, api_secret, status=None, pair=None, side=None,
     """
     endpoint = "/orders"
     
-    # Add query parameters
-    params = {}
-    if status:
-        params['status'] = status
-    if pair:
-        params['pair'] = pair
-    if side:
-        params['side'] = side
-    if order_type:
-        params['type'] = order_type
-    if start_time:
-        params['start_time'] = start_time
-    if end_time:
-        params['end_time'] = end_time
-    if limit:
-        params['limit'] = limit
-    if offset:
-        params['offset'] = offset
+    # Add query parameters, skipping filters that were not provided
+    params = {key: value for key, value in (
+        ('status', status),
+        ('pair', pair),
+        ('side', side),
+        ('type', order_type),
+        ('start_time', start_time),
+        ('end_time', end_time),
+        ('limit', limit),
+        ('offset', offset),
+    ) if value}
     
     print(f"\nGetting user orders...")
     if params:
@@ -51,7 +44,36 @@ def get_user_orders(api_key, api_secret, status=None, pair=None, side=None,
             print(f"  {key}: {value}")
     
     # Make the request using the utility function
-    return make_request(api_key, api_secret, "GET", endpoint, params=params)
+    return await make_request_async(api_key, api_secret, "GET", endpoint, params=params)
+
+def format_number(value):
+    """Format a numeric API field with 8 decimals.
+    
+    Args:
+        value: Raw field value (string, number or None)
+        
+    Returns:
+        str: Formatted number, or the raw value as a string if it is not numeric
+    """
+    try:
+        return f"{float(value):.8f}"
+    except (ValueError, TypeError):
+        return str(value)
+
+def format_column(value, width):
+    """Left-align a value in a table column, truncating it with '..' if too long.
+    
+    Args:
+        value: Value to display (converted with str)
+        width: Column width; one character is kept free as padding
+        
+    Returns:
+        str: Value padded to exactly width characters
+    """
+    text = str(value)
+    if len(text) >= width:
+        text = text[:width - 3] + ".."
+    return f"{text:<{width}}"
 
 def display_orders(orders_data):
     """Display orders data in a readable format.
@@ -60,8 +82,9 @@ def display_orders(orders_data):
         orders_data: Orders data from API response
     """
     # Print the raw response for debugging
-    print("\nAPI Response:")
-    print(json.dumps(orders_data, indent=2))
+    if DEBUG:
+        print("\nAPI Response:")
+        print(format_json(orders_data))
     
     if not orders_data:
         print("No orders data to display")
@@ -91,59 +114,21 @@ def display_orders(orders_data):
     print("-" * 120)
     
     for order in orders:
-        # Get values with defaults and convert to string to ensure proper formatting
-        order_id = str(order.get('id', 'N/A'))
-        pair = str(order.get('pair', 'N/A'))
-        side = str(order.get('side', 'N/A'))
-        order_type = str(order.get('type', 'N/A'))
-        status = str(order.get('status', 'N/A'))
-        
-        # Format numeric values
-        try:
-            price = float(order.get('price', 0))
-            price_str = f"{price:.8f}"
-        except (ValueError, TypeError):
-            price_str = str(order.get('price', 'N/A'))
-            
-        try:
-            amount = float(order.get('amount', 0))
-            amount_str = f"{amount:.8f}"
-        except (ValueError, TypeError):
-            amount_str = str(order.get('amount', 'N/A'))
-            
-        try:
-            filled = float(order.get('filled_amount', 0))
-            filled_str = f"{filled:.8f}"
-        except (ValueError, TypeError):
-            filled_str = str(order.get('filled_amount', 'N/A'))
-        
-        created_at = str(order.get('created_at', 'N/A'))
-        
-        # Truncate long strings to fit in columns
-        if len(order_id) > 11:
-            order_id = order_id[:9] + ".."
-        if len(pair) > 9:
-            pair = pair[:7] + ".."
-        if len(side) > 5:
-            side = side[:3] + ".."
-        if len(order_type) > 7:
-            order_type = order_type[:5] + ".."
-        if len(status) > 9:
-            status = status[:7] + ".."
-        if len(price_str) > 14:
-            price_str = price_str[:12] + ".."
-        if len(amount_str) > 14:
-            amount_str = amount_str[:12] + ".."
-        if len(filled_str) > 14:
-            filled_str = filled_str[:12] + ".."
-        if len(created_at) > 24:
-            created_at = created_at[:22] + ".."
-        
-        print(f"{order_id:<12} {pair:<10} {side:<6} {order_type:<8} {status:<10} {price_str:<15} {amount_str:<15} {filled_str:<15} {created_at:<25}")
+        print(" ".join((
+            format_column(order.get('id', 'N/A'), 12),
+            format_column(order.get('pair', 'N/A'), 10),
+            format_column(order.get('side', 'N/A'), 6),
+            format_column(order.get('type', 'N/A'), 8),
+            format_column(order.get('status', 'N/A'), 10),
+            format_column(format_number(order.get('price', 0)), 15),
+            format_column(format_number(order.get('amount', 0)), 15),
+            format_column(format_number(order.get('filled_amount', 0)), 15),
+            format_column(order.get('created_at', 'N/A'), 25),
+        )))
     
     print("=======================")
 
-def test_get_user_orders():
+async def test_get_user_orders():
     """Test getting user orders from Ripio Trade API."""
     # Get API credentials from environment variables
     api_key, api_secret = get_api_credentials()
@@ -155,10 +140,17 @@ def test_get_user_orders():
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=======================================")
     
-    # Example 1: Get all orders for a specific pair
+    # The three queries are independent, so issue them concurrently
     # Note: The API requires a pair parameter
-    print("\nExample 1: Getting all user orders for USDC/ARS pair...")
-    all_orders = get_user_orders(api_key, api_secret, pair="USDC_ARS")
+    tasks = [
+        get_user_orders(api_key, api_secret, pair="USDC_ARS"),
+        get_user_orders(api_key, api_secret, status="open", pair="USDC_ARS"),
+        get_user_orders(api_key, api_secret, pair="USDC_ARS", side="buy", limit=5),
+    ]
+    all_orders, open_orders, buy_orders = await asyncio.gather(*tasks)
+    
+    # Example 1: Get all orders for a specific pair
+    print("\nExample 1: All user orders for USDC/ARS pair")
     
     if not all_orders:
         print("Test failed: Could not retrieve user orders")
@@ -167,8 +159,7 @@ def test_get_user_orders():
     display_orders(all_orders)
     
     # Example 2: Get open orders for a specific pair
-    print("\nExample 2: Getting open orders for USDC/ARS pair...")
-    open_orders = get_user_orders(api_key, api_secret, status="open", pair="USDC_ARS")
+    print("\nExample 2: Open orders for USDC/ARS pair")
     
     if not open_orders:
         print("Could not retrieve open orders")
@@ -176,8 +167,7 @@ def test_get_user_orders():
         display_orders(open_orders)
     
     # Example 3: Get buy orders for a specific pair with limit
-    print("\nExample 3: Getting buy orders for USDC/ARS pair (limit: 5)...")
-    buy_orders = get_user_orders(api_key, api_secret, pair="USDC_ARS", side="buy", limit=5)
+    print("\nExample 3: Buy orders for USDC/ARS pair (limit: 5)")
     
     if not buy_orders:
         print("Could not retrieve buy orders")
@@ -189,7 +179,7 @@ def test_get_user_orders():
 
 if __name__ == "__main__":
     print("Testing Ripio Trade user orders retrieval...")
-    success = test_get_user_orders()
+    success = asyncio.run(test_get_user_orders())
     
     if success:
         print("\nTest completed successfully!")
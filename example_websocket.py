@@ -1,15 +1,48 @@
 #!/usr/bin/env python3
 import asyncio
-import json
+import logging
+import logging.handlers
+import sys
 import websockets
-import requests
 import time
+from queue import SimpleQueue
 from datetime import datetime
-from ripio_api_utils import make_request, get_api_credentials, create_auth_headers
+from ripio_api_utils import make_request_async, get_api_credentials, create_auth_headers, encode_json, decode_json
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # WebSocket URL
 WSS_URL = "wss://ws.ripiotrade.co"
 
+# Maximum number of received frames buffered between the socket reader and
+# the message handler; when it is full the oldest (stalest) frame is evicted
+MESSAGE_QUEUE_SIZE = 1024
+
+# Largest frame accepted from the server. Balance updates are small JSON
+# objects; raise this when subscribing to bulkier topics such as order books
+MAX_FRAME_SIZE = 2**16
+
+logger = logging.getLogger(__name__)
+
+def start_logging():
+    """
+    Send log records through an in-memory queue to a background thread that
+    writes them to stdout, so logging from the receive loop never waits on
+    console I/O. All of this example's console output goes through logging,
+    so it stays in order. Returns the QueueListener; stop it to flush
+    pending records.
+    """
+    log_queue = SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    # Records are formatted by the QueueHandler before they are queued
+    logging.basicConfig(level=logging.INFO, format="%(message)s",
+                        handlers=[logging.handlers.QueueHandler(log_queue)])
+    listener.start()
+    return listener
+
 async def get_websocket_ticket(api_key, api_secret):
     """
     Get a WebSocket ticket by making an authenticated REST API call
@@ -17,60 +50,224 @@ async def get_websocket_ticket(api_key, api_secret):
     # API endpoint for getting a WebSocket ticket
     endpoint = "/ticket"
     
-    print(f"Making request to get WebSocket ticket...")
+    logger.info("Making request to get WebSocket ticket...")
     
-    # Make the request using the utility function
-    response = make_request(api_key, api_secret, "POST", endpoint)
+    # Make the request in a worker thread so the event loop is not blocked
+    response = await make_request_async(api_key, api_secret, "POST", endpoint)
     
-    if response and 'data' in response and 'ticket' in response['data']:
-        ticket = response['data']['ticket']
-        print(f"Successfully obtained WebSocket ticket: {ticket[:10]}...")
+    ticket = ((response or {}).get('data') or {}).get('ticket')
+    if ticket:
+        logger.info("Successfully obtained WebSocket ticket: %s...", ticket[:10])
         return ticket
     else:
-        print(f"Failed to get WebSocket ticket")
+        logger.error("Failed to get WebSocket ticket")
+        logger.debug("Unexpected ticket response: %s", response)
         return None
 
-async def connect_and_subscribe(ticket, api_key, api_secret):
+async def read_messages(websocket, queue):
     """
-    Connect to WebSocket and subscribe to a private channel using the ticket
+    Move raw frames from the WebSocket into a bounded queue so the socket keeps
+    draining even while the handler is busy. Raises ConnectionClosed when the
+    connection ends.
     """
-    try:
+    async for message in websocket:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Balance and book updates supersede each other: evict the stalest
+            queue.get_nowait()
+            queue.put_nowait(message)
+            logger.warning("Message queue full, dropped the oldest message")
+    
+    # Iteration stops quietly on a clean close; recv() on the closed socket
+    # raises the matching ConnectionClosed so the caller can reconnect
+    await websocket.recv()
+
+def handle_message(message, raw):
+    """
+    Process one WebSocket message. Runs in a worker thread, so CPU-heavy
+    processing here does not block the event loop.
+    
+    Args:
+        message: Decoded JSON message (the raw frame if it is not JSON)
+        raw: Frame exactly as sent by the server
+    """
+    logger.info("Received message: %s", raw)
+
+async def consume_messages(queue, count):
+    """
+    Decode and handle the next `count` frames from the queue.
+    """
+    loop = asyncio.get_running_loop()
+    for _ in range(count):
+        raw = await queue.get()
+        try:
+            message = decode_json(raw)
+        except ValueError:
+            message = raw  # Not JSON; hand over the raw frame
+        await loop.run_in_executor(None, handle_message, message, raw)
+
+class RipioClient:
+    """
+    Authenticated WebSocket client that keeps one connection and one ticket.
+    
+    Entering `async with` opens the connection and fetches the first ticket
+    concurrently. Tickets are requested over the shared pooled REST session,
+    so refreshes reuse its TLS connection, and subscriptions reuse the open
+    WebSocket instead of connecting again.
+    """
+    
+    def __init__(self, api_key, api_secret):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.ticket = None
+        self.websocket = None
+    
+    async def __aenter__(self):
+        # The ticket is only needed to subscribe, so fetch it while connecting
+        ticket_task = asyncio.create_task(self.refresh_ticket())
+        try:
+            await self.connect()
+        except websockets.exceptions.InvalidStatusCode as e:
+            # An unauthorized handshake is retried by connect_and_subscribe
+            # once the fresh ticket below has arrived
+            if e.status_code != 401:
+                ticket_task.cancel()
+                raise
+        except BaseException:
+            ticket_task.cancel()
+            raise
+        
+        # __aexit__ will not run if entering fails, so close the connection here
+        try:
+            await ticket_task
+        except BaseException:
+            await self.close()
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def connect(self):
+        """Open the WebSocket connection, closing any previous one first."""
+        await self.close()
+        
         # Create authentication headers for WebSocket connection
+        # (fresh on every attempt so the timestamp is current)
         path = "ws"
-        headers, timestamp = create_auth_headers(api_key, api_secret, "GET", path)
+        headers, timestamp = create_auth_headers(self.api_key, self.api_secret, "GET", path)
         
-        print(f"Connecting to WebSocket at {WSS_URL} with authentication headers...")
-        async with websockets.connect(WSS_URL, extra_headers=headers) as websocket:
-            print("Connected to WebSocket")
-            
-            # Subscribe to balance channel with ticket
-            balance_payload = {
-                "method": "subscribe",
-                "topics": ["balance"],
-                "ticket": ticket,  # Include ticket for authentication
-                "id": int(time.time() * 1000)
-            }
+        logger.info("Connecting to WebSocket at %s with authentication headers...", WSS_URL)
+        self.websocket = await websockets.connect(
+            WSS_URL,
+            extra_headers=headers,
+            ping_interval=20,  # Keep-alive pings detect dead connections
+            ping_timeout=20,
+            max_size=MAX_FRAME_SIZE,
+            compression=None  # Frames are tiny; skip per-frame zlib work
+        )
+        logger.info("Connected to WebSocket")
+    
+    async def close(self):
+        """Close the WebSocket connection if it is open."""
+        if self.websocket is not None:
+            websocket, self.websocket = self.websocket, None
+            await websocket.close()
+    
+    async def refresh_ticket(self):
+        """Request a new WebSocket ticket; returns it, or None on failure."""
+        self.ticket = await get_websocket_ticket(self.api_key, self.api_secret)
+        return self.ticket
+    
+    async def subscribe(self, topics):
+        """
+        Subscribe to all topics with a single frame on the open connection.
+        
+        Returns:
+            The server's subscription response
+        """
+        subscribe_payload = {
+            "method": "subscribe",
+            "topics": list(topics),
+            "ticket": self.ticket,  # Include ticket for authentication
+            "id": time.time_ns() // 1_000_000
+        }
+        
+        logger.info("Subscribing to %s channel(s) with ticket...", ', '.join(topics))
+        # Sent as a text frame: encode_json returns UTF-8 bytes, which
+        # websockets would otherwise send as a binary frame
+        await self.websocket.send(encode_json(subscribe_payload).decode('utf-8'))
+        
+        # Wait for subscription response
+        return await self.websocket.recv()
+
+async def connect_and_subscribe(client, topics=("balance",), max_reconnects=3):
+    """
+    Subscribe to private channels on the client's connection and print the
+    updates received over the next few seconds.
+    
+    Dropped connections are re-established (up to max_reconnects times) with
+    the same ticket; a new ticket is only requested if the server rejects
+    the connection as unauthorized.
+    """
+    reconnects = 0
+    
+    while True:
+        try:
+            if client.websocket is None:
+                await client.connect()
             
-            print(f"Subscribing to balance channel with ticket...")
-            await websocket.send(json.dumps(balance_payload))
+            if not client.ticket:
+                logger.error("Failed to get WebSocket ticket. Cannot proceed with WebSocket test.")
+                return
             
-            # Wait for subscription response
-            response = await websocket.recv()
-            print(f"Subscription response: {response}")
+            response = await client.subscribe(topics)
+            logger.info("Subscription response: %s", response)
             
             # Keep connection open for a while to receive updates
-            print("Waiting for balance updates (will timeout after 3 seconds)...")
-            for _ in range(3):  # Try to receive 3 messages or timeout
-                try:
-                    message = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                    print(f"Received message: {message}")
-                except asyncio.TimeoutError:
-                    print("No message received (timeout)")
-            
-            print("Test completed")
+            logger.info("Waiting for updates (will timeout after 3 seconds)...")
+            queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_SIZE)
+            reader = asyncio.create_task(read_messages(client.websocket, queue))
+            # Try to receive 3 messages, under one overall timeout
+            consumer = asyncio.create_task(consume_messages(queue, 3))
+            try:
+                done, _ = await asyncio.wait({consumer, reader}, timeout=3.0,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if consumer in done:
+                    consumer.result()
+                elif reader in done:
+                    reader.result()  # Re-raise ConnectionClosed to reconnect
+                else:
+                    logger.info("No more messages received (timeout)")
+            finally:
+                consumer.cancel()
+                reader.cancel()
             
-    except Exception as e:
-        print(f"Error in WebSocket connection: {e}")
+            logger.info("Test completed")
+            return
+        
+        except websockets.exceptions.InvalidStatusCode as e:
+            if e.status_code != 401 or reconnects >= max_reconnects:
+                logger.error("Error in WebSocket connection: %s", e)
+                return
+            reconnects += 1
+            logger.warning("WebSocket connection unauthorized, requesting a new ticket...")
+            if not await client.refresh_ticket():
+                return
+        
+        except websockets.exceptions.ConnectionClosed as e:
+            await client.close()
+            if reconnects >= max_reconnects:
+                logger.error("WebSocket connection closed, giving up: %s", e)
+                return
+            reconnects += 1
+            logger.warning("WebSocket connection closed (%s), reconnecting (%d/%d)...", e, reconnects, max_reconnects)
+            await asyncio.sleep(1)
+        
+        except Exception as e:
+            logger.error("Error in WebSocket connection: %s", e)
+            return
 
 async def main():
     # Get API credentials from environment variables
@@ -79,15 +276,20 @@ async def main():
     if not api_key or not api_secret:
         return
     
-    # Get a WebSocket ticket
-    ticket = await get_websocket_ticket(api_key, api_secret)
-    
-    if ticket:
-        # Connect to WebSocket and subscribe to a private channel
-        await connect_and_subscribe(ticket, api_key, api_secret)
-    else:
-        print("Failed to get WebSocket ticket. Cannot proceed with WebSocket test.")
+    try:
+        # Open one client for the whole session and subscribe to a private channel
+        async with RipioClient(api_key, api_secret) as client:
+            await connect_and_subscribe(client, topics=["balance"])
+    except Exception as e:
+        logger.error("Error in WebSocket connection: %s", e)
 
 if __name__ == "__main__":
     print("Testing Ripio WebSocket authentication with ticket...")
-    asyncio.run(main())
+    listener = start_logging()
+    if uvloop is not None:
+        # libuv-based event loop: faster socket I/O for the same coroutines
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    try:
+        asyncio.run(main())
+    finally:
+        listener.stop()
@@ -1,26 +1,40 @@
 #!/usr/bin/env python3
-import json
+import asyncio
 import time
 from datetime import datetime, timedelta
-from ripio_api_utils import make_request, get_api_credentials
+from ripio_api_utils import make_request_async, get_api_credentials
 
-def get_withdrawal_fees(api_key, api_secret, currency_code):
+# Withdrawal fees change slowly, so successful fee lookups are reused for
+# FEE_CACHE_TTL seconds. Maps currency code -> (fetch time, API response).
+FEE_CACHE_TTL = 60
+_fee_cache = {}
+
+async def get_withdrawal_fees(api_key, api_secret, currency_code, force_refresh=False):
     """Get withdrawal fees for a specific cryptocurrency.
     
     Args:
         api_key: API key
         api_secret: API secret
         currency_code: Currency code (e.g., 'BTC', 'ETH', 'USDC')
+        force_refresh: If True, bypass the fee cache and query the API
         
     Returns:
         dict: API response with fee information
     """
     endpoint = f"/withdrawals/estimate-fee/{currency_code}"
     
-    print(f"\nFetching withdrawal fees for {currency_code}...")
-    
-    # Make the request using the utility function
-    response = make_request(api_key, api_secret, "GET", endpoint)
+    cached = _fee_cache.get(currency_code)
+    if not force_refresh and cached and time.monotonic() - cached[0] < FEE_CACHE_TTL:
+        print(f"\nUsing cached withdrawal fees for {currency_code}...")
+        response = cached[1]
+    else:
+        print(f"\nFetching withdrawal fees for {currency_code}...")
+        
+        # Make the request using the utility function
+        response = await make_request_async(api_key, api_secret, "GET", endpoint)
+        
+        if response and 'data' in response:
+            _fee_cache[currency_code] = (time.monotonic(), response)
     
     if response and 'data' in response:
         fee_data = response['data']
@@ -52,7 +66,7 @@ def get_withdrawal_fees(api_key, api_secret, currency_code):
     
     return response
 
-def create_withdrawal(api_key, api_secret, currency_code, amount, destination_address, 
+async def create_withdrawal(api_key, api_secret, currency_code, amount, destination_address, 
                      tag=None, network=None, memo=None, external_id=None):
     """Create a new cryptocurrency withdrawal.
     
@@ -80,17 +94,12 @@ def create_withdrawal(api_key, api_secret, currency_code, amount, destination_ad
     }
     
     # Only add optional parameters if they have values (not None)
-    if network:
-        withdrawal_data["network"] = network
-        
-    if tag:
-        withdrawal_data["tag"] = tag
-        
-    if memo:
-        withdrawal_data["memo"] = memo
-        
-    if external_id:
-        withdrawal_data["external_id"] = external_id
+    withdrawal_data.update({key: value for key, value in (
+        ("network", network),
+        ("tag", tag),
+        ("memo", memo),
+        ("external_id", external_id),
+    ) if value})
     
     print(f"\nCreating withdrawal for {amount} {currency_code}...")
     print(f"Destination: {destination_address}")
@@ -98,7 +107,7 @@ def create_withdrawal(api_key, api_secret, currency_code, amount, destination_ad
         print(f"Network: {network}")
     
     # Make the request using the utility function
-    response = make_request(api_key, api_secret, "POST", endpoint, data=withdrawal_data)
+    response = await make_request_async(api_key, api_secret, "POST", endpoint, data=withdrawal_data)
     
     if response:
         print("Withdrawal request created successfully!")
@@ -107,7 +116,7 @@ def create_withdrawal(api_key, api_secret, currency_code, amount, destination_ad
         
     return response
 
-def get_withdrawal_status(api_key, api_secret, withdrawal_id):
+async def get_withdrawal_status(api_key, api_secret, withdrawal_id):
     """Get the status of a specific withdrawal.
     
     Args:
@@ -128,7 +137,7 @@ def get_withdrawal_status(api_key, api_secret, withdrawal_id):
     print(f"\nChecking status for withdrawal ID: {withdrawal_id}...")
     
     # Make the request using the utility function
-    response = make_request(api_key, api_secret, "GET", endpoint, params=params)
+    response = await make_request_async(api_key, api_secret, "GET", endpoint, params=params)
     
     if response and 'data' in response:
         withdrawal = response['data']
@@ -142,7 +151,25 @@ def get_withdrawal_status(api_key, api_secret, withdrawal_id):
     
     return response
 
-def list_withdrawals(api_key, api_secret, currency_code=None, status=None, 
+async def get_withdrawal_statuses(api_key, api_secret, withdrawal_ids):
+    """Get the status of several withdrawals concurrently.
+    
+    Args:
+        api_key: API key
+        api_secret: API secret
+        withdrawal_ids: IDs of the withdrawals to check
+        
+    Returns:
+        list: API responses in the same order as withdrawal_ids (None for failed lookups)
+    """
+    responses = await asyncio.gather(
+        *(get_withdrawal_status(api_key, api_secret, withdrawal_id) for withdrawal_id in withdrawal_ids),
+        return_exceptions=True
+    )
+    
+    return [None if isinstance(response, Exception) else response for response in responses]
+
+async def list_withdrawals(api_key, api_secret, currency_code=None, status=None, 
                     from_date=None, to_date=None, limit=10, offset=0):
     """List withdrawals with optional filters.
     
@@ -167,19 +194,17 @@ def list_withdrawals(api_key, api_secret, currency_code=None, status=None,
         "offset": offset
     }
     
-    if currency_code:
-        params["currency_code"] = currency_code
-    if status:
-        params["status"] = status
-    if from_date:
-        params["from_date"] = from_date
-    if to_date:
-        params["to_date"] = to_date
+    params.update({key: value for key, value in (
+        ("currency_code", currency_code),
+        ("status", status),
+        ("from_date", from_date),
+        ("to_date", to_date),
+    ) if value})
     
     print("\nFetching withdrawals...")
     
     # Make the request using the utility function
-    response = make_request(api_key, api_secret, "GET", endpoint, params=params)
+    response = await make_request_async(api_key, api_secret, "GET", endpoint, params=params)
     
     return response
 
@@ -220,7 +245,7 @@ def display_withdrawals_table(withdrawals):
         else:
             print(f"Unexpected withdrawal format: {type(withdrawal)}")
 
-def demo_withdrawal_workflow():
+async def demo_withdrawal_workflow():
     """Demonstrate the withdrawal workflow with safety checks."""
     # Get API credentials from environment variables
     api_key, api_secret = get_api_credentials()
@@ -228,8 +253,11 @@ def demo_withdrawal_workflow():
     if not api_key or not api_secret:
         return
     
+    # Read the clock once; it is used for the banner and the listing window
+    now = datetime.now()
+    
     print("===== RIPIO TRADE WITHDRAWAL EXAMPLE =====")
-    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Timestamp: {now.strftime('%Y-%m-%d %H:%M:%S')}")
     print("==========================================")
     
     print("\n⚠️  WARNING: This example uses TEST addresses.")
@@ -237,15 +265,36 @@ def demo_withdrawal_workflow():
     print("⚠️  Always verify addresses before making real withdrawals!")
     
     # Step 1: Try to get withdrawal fees (may not be available for all currencies)
-    currency = "USDC"
+    # The USDC and BTC fee probes and the withdrawals listing (Step 4) are
+    # independent, so they are all issued concurrently
     print("\nNote: Withdrawal fees endpoint may not be available for all currencies.")
-    fees_response = get_withdrawal_fees(api_key, api_secret, currency)
     
-    if not fees_response:
-        # Try with a different currency
-        print("\nTrying with BTC instead...")
+    # Get withdrawals from the last 30 days
+    to_date = now
+    from_date = to_date - timedelta(days=30)
+    
+    usdc_fees, btc_fees, list_response = await asyncio.gather(
+        get_withdrawal_fees(api_key, api_secret, "USDC"),
+        get_withdrawal_fees(api_key, api_secret, "BTC"),
+        list_withdrawals(
+            api_key,
+            api_secret,
+            from_date=from_date.isoformat(),
+            to_date=to_date.isoformat(),
+            limit=20
+        ),
+        return_exceptions=True
+    )
+    
+    # Prefer USDC, fall back to BTC if the USDC fee lookup failed
+    if usdc_fees and not isinstance(usdc_fees, Exception):
+        currency = "USDC"
+    elif btc_fees and not isinstance(btc_fees, Exception):
+        print("\nUSDC fees unavailable, using BTC instead...")
+        currency = "BTC"
+    else:
+        print("\nNo fee data available for USDC or BTC; continuing the demo with BTC...")
         currency = "BTC"
-        fees_response = get_withdrawal_fees(api_key, api_secret, currency)
     
     # Step 2: Create a test withdrawal (with dummy address)
     # WARNING: This is a TEST address - DO NOT use in production!
@@ -259,7 +308,7 @@ def demo_withdrawal_workflow():
     # Uncomment the following lines to actually create a withdrawal
     # BE VERY CAREFUL - only use with test addresses!
     """
-    create_response = create_withdrawal(
+    create_response = await create_withdrawal(
         api_key,
         api_secret,
         currency,
@@ -274,26 +323,16 @@ def demo_withdrawal_workflow():
         # Step 3: Check withdrawal status
         if withdrawal_id:
             print("\nWaiting 2 seconds before checking status...")
-            time.sleep(2)
-            get_withdrawal_status(api_key, api_secret, withdrawal_id)
+            await asyncio.sleep(2)
+            await get_withdrawal_status(api_key, api_secret, withdrawal_id)
     """
     
     # Step 4: List recent withdrawals
     print("\n\n===== RECENT WITHDRAWALS =====")
     
-    # Get withdrawals from the last 30 days
-    to_date = datetime.now()
-    from_date = to_date - timedelta(days=30)
-    
-    list_response = list_withdrawals(
-        api_key,
-        api_secret,
-        from_date=from_date.isoformat(),
-        to_date=to_date.isoformat(),
-        limit=20
-    )
-    
-    if list_response and 'data' in list_response:
+    if isinstance(list_response, Exception):
+        print(f"Error listing withdrawals: {list_response}")
+    elif list_response and 'data' in list_response:
         response_data = list_response['data']
         
         # Check if response has pagination structure
@@ -327,10 +366,19 @@ def demo_withdrawal_workflow():
                 print("\nWithdrawals by status:")
                 for status, count in status_counts.items():
                     print(f"  {status}: {count}")
+            
+            # Refresh the status of all in-flight withdrawals at once
+            pending_ids = [
+                w.get('id') for w in withdrawals
+                if isinstance(w, dict) and w.get('id') and w.get('status') in ('pending', 'processing')
+            ]
+            if pending_ids:
+                print(f"\nChecking current status of {len(pending_ids)} pending withdrawal(s)...")
+                await get_withdrawal_statuses(api_key, api_secret, pending_ids)
     
     print("\n==========================================")
 
-def create_real_withdrawal_with_confirmation():
+async def create_real_withdrawal_with_confirmation():
     """Create a real withdrawal with user confirmation.
     
     This function includes safety checks and requires explicit user confirmation.
@@ -349,8 +397,8 @@ def create_real_withdrawal_with_confirmation():
     # Get withdrawal parameters from user
     currency = input("Enter currency code (e.g., BTC, ETH, USDC): ").upper()
     
-    # Get fees first
-    fees_response = get_withdrawal_fees(api_key, api_secret, currency)
+    # Get fees first, bypassing the cache since real funds are about to move
+    fees_response = await get_withdrawal_fees(api_key, api_secret, currency, force_refresh=True)
     
     if not fees_response:
         print("Failed to get withdrawal fees. Aborting.")
@@ -384,7 +432,7 @@ def create_real_withdrawal_with_confirmation():
         return
     
     # Create the withdrawal
-    response = create_withdrawal(
+    response = await create_withdrawal(
         api_key,
         api_secret,
         currency,
@@ -405,8 +453,8 @@ def create_real_withdrawal_with_confirmation():
         # Check withdrawal status after creation
         if withdrawal_id:
             print("\nWaiting 2 seconds before checking status...")
-            time.sleep(2)
-            get_withdrawal_status(api_key, api_secret, withdrawal_id)
+            await asyncio.sleep(2)
+            await get_withdrawal_status(api_key, api_secret, withdrawal_id)
         
         print("\nPlease check your email for confirmation if required.")
     else:
@@ -417,8 +465,8 @@ if __name__ == "__main__":
     
     if len(sys.argv) > 1 and sys.argv[1] == "--real":
         # Run the real withdrawal function with confirmations
-        create_real_withdrawal_with_confirmation()
+        asyncio.run(create_real_withdrawal_with_confirmation())
     else:
         # Run the demo workflow
-        demo_withdrawal_workflow()
+        asyncio.run(demo_withdrawal_workflow())
         print("\nTo create a real withdrawal, run: python example_withdrawals.py --real")
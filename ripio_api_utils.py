@@ -1,14 +1,242 @@
 #!/usr/bin/env python3
 import os
-import base64
-import hmac
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import binascii
 import hashlib
 import time
 import json
+import logging
+import threading
 import requests
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def generate_signature(api_secret, timestamp, method, path, payload=""):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Set RIPIO_DEBUG=1 to print raw API responses in the examples
+DEBUG = bool(os.environ.get('RIPIO_DEBUG'))
+
+# (connect, read) timeouts in seconds so a stalled socket cannot hang a request
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Set RIPIO_LOG_PATH to archive every successful API response to that file
+LOG_PATH = os.environ.get('RIPIO_LOG_PATH')
+
+# Shared HTTP session so consecutive requests to the API reuse the same
+# TCP/TLS connection instead of performing a new handshake each time.
+# Transient gateway errors are retried with a short backoff; POST is not
+# retried so an order or withdrawal is never submitted twice. Retries replay
+# the original signed headers, so 429s are not retried (the client-side rate
+# limiter paces requests instead) and Retry-After is ignored to keep the
+# replayed timestamp fresh.
+# Responses are requested compressed: requests advertises gzip/deflate, and
+# also br (Brotli) when the optional brotli package is installed.
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET', 'DELETE']),
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+))
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace requests on the client side.
+    
+    Tokens refill continuously at `rate` per second up to `burst`; acquire
+    blocks until enough tokens are available. Pacing bursts here is cheaper
+    than letting the server answer 429 and waiting out the retry backoff.
+    """
+    
+    def __init__(self, rate, burst):
+        """
+        Args:
+            rate: Tokens added per second (must be positive)
+            burst: Maximum number of tokens that can accumulate (at least 1)
+        """
+        self._validate(rate, burst)
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _validate(rate, burst):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"Burst must be at least 1 token, got {burst}")
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def set_rate(self, rate, burst=None):
+        """Change the refill rate (and optionally the burst size)."""
+        self._validate(rate, self.burst if burst is None else burst)
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            if burst is not None:
+                self.burst = burst
+                self._tokens = min(self._tokens, burst)
+    
+    def acquire(self, n=1):
+        """Take n tokens, sleeping until they are available."""
+        while True:
+            with self._lock:
+                # At least one token, and never more than can accumulate
+                if n < 1 or n > self.burst:
+                    raise ValueError(f"Cannot acquire {n} tokens with a burst of {self.burst}")
+                self._refill()
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return
+                wait = (n - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Client-side request pacing shared by every request made through this
+# module, so concurrent batches slow down instead of tripping the API's
+# rate limit. Adjust with set_rate() to match your account's limits.
+DEFAULT_RATE_LIMIT = 10  # requests per second
+_rate_limiter = TokenBucket(DEFAULT_RATE_LIMIT, DEFAULT_RATE_LIMIT)
+
+def set_rate(rps, burst=None):
+    """Set the client-side request rate limit.
+    
+    Args:
+        rps: Requests per second allowed on average
+        burst: Requests allowed back to back (defaults to rps, and to 1
+            for rates below one request per second)
+    """
+    _rate_limiter.set_rate(rps, burst if burst is not None else max(1, rps))
+
+def encode_json(data):
+    """Serialize data to compact JSON, using orjson when it is installed.
+    
+    Args:
+        data: JSON-serializable object
+        
+    Returns:
+        bytes: UTF-8 encoded JSON without whitespace
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+def decode_json(content):
+    """Parse JSON content, using orjson when it is installed.
+    
+    Args:
+        content: JSON document as bytes or str
+        
+    Returns:
+        Parsed JSON object
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def format_json(data):
+    """Pretty-print data as JSON with a 2-space indent.
+    
+    Args:
+        data: JSON-serializable object
+        
+    Returns:
+        str: Indented JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2)
+
+@functools.lru_cache(maxsize=4)
+def _secret_bytes(api_secret):
+    """Return the UTF-8 encoded API secret, cached across requests."""
+    return api_secret.encode('utf-8')
+
+# SHA-256 block size in bytes, which HMAC pads the key to
+_SHA256_BLOCK_SIZE = 64
+
+@functools.lru_cache(maxsize=4)
+def _hmac_pads(api_secret):
+    """Return the HMAC-SHA256 (inner, outer) key pads for the API secret.
+    
+    Computed once per secret, so signing is just two hashlib calls with no
+    per-signature key setup or hmac object allocation.
+    """
+    key = _secret_bytes(api_secret)
+    if len(key) > _SHA256_BLOCK_SIZE:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(_SHA256_BLOCK_SIZE, b"\0")
+    return bytes(b ^ 0x36 for b in key), bytes(b ^ 0x5C for b in key)
+
+def _sign(api_secret, message):
+    """Compute the Base64 HMAC-SHA256 signature of a message.
+    
+    This is the only place requests are signed. It calls hashlib.sha256,
+    which runs OpenSSL's SHA-256 (SHA-NI/AVX2 accelerated on CPUs that
+    support it); third-party wrappers such as PyCryptodome's HMAC are
+    several times slower for inputs this small.
+    
+    Args:
+        api_secret: API secret key
+        message: Bytes to sign
+        
+    Returns:
+        str: Base64 encoded signature
+    """
+    # HMAC is H(opad + H(ipad + message)), with the key pads cached per secret
+    ipad, opad = _hmac_pads(api_secret)
+    signature = hashlib.sha256(opad + hashlib.sha256(ipad + message).digest()).digest()
+    # binascii skips base64.b64encode's altchars handling; same output
+    return binascii.b2a_base64(signature, newline=False).decode('ascii')
+
+def log_response(data):
+    """Append an API response to the archive file at LOG_PATH, if set.
+    
+    Responses are written as consecutive MessagePack objects when msgpack is
+    installed (read back with msgpack.Unpacker), otherwise as JSON lines.
+    
+    Args:
+        data: Decoded API response
+    """
+    if not LOG_PATH:
+        return
+    
+    if msgpack is not None:
+        record = msgpack.packb(data, use_bin_type=True)
+    else:
+        record = encode_json(data) + b"\n"
+    
+    # The archive is optional; failing to write it must not fail the request
+    try:
+        with open(LOG_PATH, 'ab') as f:
+            f.write(record)
+    except OSError as e:
+        logger.warning("Could not write response log %s: %s", LOG_PATH, e)
+
+def generate_signature(api_secret, timestamp, method, path, payload=b""):
     """Generate signature for Ripio Trade API.
     
     Args:
@@ -16,27 +244,22 @@ def generate_signature(api_secret, timestamp, method, path, payload=""):
         timestamp: Current timestamp in milliseconds
         method: HTTP method (GET, POST, DELETE)
         path: API endpoint path
-        payload: JSON payload for POST requests
+        payload: JSON payload for POST requests (bytes or str)
         
     Returns:
         str: Base64 encoded signature
     """
-    # Create message string: Timestamp + HTTP Method + Path + JSON Payload
-    message = f"{timestamp}{method}{path}{payload}"
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
     
-
-    
-    # Create HMAC SHA256 signature
-    signature = hmac.new(
-        api_secret.encode('utf-8'),
-        message.encode('utf-8'),
-        hashlib.sha256
-    ).digest()
+    # Create message: Timestamp + HTTP Method + Path + JSON Payload. Only the
+    # short prefix needs encoding; the payload is already the bytes being sent
+    message = f"{timestamp}{method}{path}".encode('utf-8') + payload
     
-    # Encode in Base64
-    return base64.b64encode(signature).decode('utf-8')
+    # Create the Base64 encoded HMAC SHA256 signature
+    return _sign(api_secret, message)
 
-def create_auth_headers(api_key, api_secret, method, path, payload=""):
+def create_auth_headers(api_key, api_secret, method, path, payload=b""):
     """Create authentication headers for Ripio Trade API.
     
     Args:
@@ -44,12 +267,12 @@ def create_auth_headers(api_key, api_secret, method, path, payload=""):
         api_secret: API secret
         method: HTTP method (GET, POST, DELETE)
         path: API endpoint path
-        payload: JSON payload for POST requests
+        payload: JSON payload for POST requests (bytes or str)
         
     Returns:
         dict: Headers for API request
     """
-    timestamp = str(int(time.time() * 1000))
+    timestamp = str(time.time_ns() // 1_000_000)
     
     signature = generate_signature(api_secret, timestamp, method, path, payload)
     
@@ -62,7 +285,98 @@ def create_auth_headers(api_key, api_secret, method, path, payload=""):
     
     return headers, timestamp
 
-def make_request(api_key, api_secret, method, endpoint, params=None, data=None):
+API_BASE_URL = "https://api.ripiotrade.co/v4"
+
+# Error bodies are logged up to this many characters
+MAX_ERROR_BODY_LENGTH = 512
+
+@functools.lru_cache(maxsize=128)
+def bind_endpoint(method, endpoint):
+    """Build a request function specialized for one HTTP method and endpoint.
+    
+    The URL, signing path and session method are resolved once here, so each
+    call only signs and sends the request. Results are cached, so binding
+    the same endpoint again returns the same function.
+    
+    Args:
+        method: HTTP method (GET, POST, DELETE)
+        endpoint: API endpoint (should start with /)
+        
+    Returns:
+        function: call(api_key, api_secret, params=None, data=None, body=None)
+        returning the API response as a dict, or None on failure
+    """
+    url = API_BASE_URL + endpoint
+    path = "/v4" + endpoint
+    
+    if method not in ("GET", "POST", "DELETE"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
+    
+    # GET sends its arguments as query parameters; POST and DELETE as a JSON body
+    is_get = method == "GET"
+    
+    def send(headers, params, payload):
+        return _session.request(
+            method,
+            url,
+            headers=headers,
+            params=params if is_get else None,
+            data=None if is_get else payload,
+            timeout=REQUEST_TIMEOUT
+        )
+    
+    def call(api_key, api_secret, params=None, data=None, body=None):
+        # Prepare payload
+        payload = b""
+        if body is not None:
+            payload = body
+        elif data:
+            # JSON serialization without sorting keys - maintain order as provided
+            payload = encode_json(data)
+        
+        # Wait for a rate limit slot before signing so the timestamp is fresh
+        _rate_limiter.acquire()
+        
+        # Create authentication headers
+        headers, timestamp = create_auth_headers(api_key, api_secret, method, path, payload)
+        
+        try:
+            # Make the request
+            response = send(headers, params, payload)
+            
+            # Log response status
+            logger.debug("Response status code: %d", response.status_code)
+            
+            # Handle successful responses (200 OK, 201 Created)
+            if response.status_code in [200, 201]:
+                try:
+                    data = decode_json(response.content)
+                except ValueError:
+                    # e.g. an HTML page from a proxy, or an empty body
+                    logger.warning("API request %s %s returned a non-JSON body: %s",
+                                   method, endpoint,
+                                   response.text[:MAX_ERROR_BODY_LENGTH])
+                    return None
+                log_response(data)
+                return data
+            else:
+                # Log the raw body (truncated) rather than parsing and
+                # re-serializing it, which adds up during bursts of 429s
+                logger.warning("API request %s %s failed with status code %d: %s",
+                               method, endpoint, response.status_code,
+                               response.text[:MAX_ERROR_BODY_LENGTH])
+                return None
+                
+        except requests.exceptions.RequestException as e:
+            logger.error("Error making request %s %s: %s", method, endpoint, e)
+            if hasattr(e, 'response') and e.response:
+                logger.error("Response status code %d: %s", e.response.status_code,
+                             e.response.text[:MAX_ERROR_BODY_LENGTH])
+            return None
+    
+    return call
+
+def make_request(api_key, api_secret, method, endpoint, params=None, data=None, body=None):
     """Make a request to Ripio Trade API with authentication.
     
     Args:
@@ -72,61 +386,77 @@ def make_request(api_key, api_secret, method, endpoint, params=None, data=None):
         endpoint: API endpoint (should start with /)
         params: Query parameters for GET requests
         data: Data payload for POST/DELETE requests
+        body: Pre-encoded JSON payload (bytes), used instead of data
         
     Returns:
         dict: API response
     """
-    base_url = "https://api.ripiotrade.co/v4"
-    url = base_url + endpoint
-    path = "/v4" + endpoint
+    if method not in ("GET", "POST", "DELETE"):
+        logger.error("Unsupported HTTP method: %s", method)
+        return None
     
-    # Prepare payload
-    payload = ""
-    if data:
-        # JSON serialization without sorting keys - maintain order as provided
-        payload = json.dumps(data, separators=(',', ':'))
+    return bind_endpoint(method, endpoint)(api_key, api_secret, params, data, body)
+
+async def make_request_async(api_key, api_secret, method, endpoint, params=None, data=None, body=None):
+    """Make an authenticated request without blocking the event loop.
     
-    # Create authentication headers
-    headers, timestamp = create_auth_headers(api_key, api_secret, method, path, payload)
+    Runs make_request in the loop's default executor so several requests
+    can be awaited concurrently (e.g. with asyncio.gather).
     
-    try:
-        # Make the request
-        if method == "GET":
-            response = requests.get(url, headers=headers, params=params)
-        elif method == "POST":
-            response = requests.post(url, headers=headers, data=payload)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers, data=payload)
-        else:
-            print(f"Unsupported HTTP method: {method}")
-            return None
+    Args:
+        api_key: API key
+        api_secret: API secret
+        method: HTTP method (GET, POST, DELETE)
+        endpoint: API endpoint (should start with /)
+        params: Query parameters for GET requests
+        data: Data payload for POST/DELETE requests
+        body: Pre-encoded JSON payload (bytes), used instead of data
         
-        # Print response status
-        print(f"Response status code: {response.status_code}")
+    Returns:
+        dict: API response
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None,
+        functools.partial(make_request, api_key, api_secret, method, endpoint, params, data, body)
+    )
+
+def make_requests_parallel(api_key, api_secret, requests_list, max_workers=8):
+    """Make several independent authenticated requests concurrently.
+    
+    Args:
+        api_key: API key
+        api_secret: API secret
+        requests_list: Sequence of (method, endpoint[, params[, data]]) tuples
+        max_workers: Maximum number of requests in flight at once
         
-        # Handle successful responses (200 OK, 201 Created)
-        if response.status_code in [200, 201]:
-            data = response.json()
-            return data
-        else:
-            print(f"API request failed with status code: {response.status_code}")
-            try:
-                error_data = response.json()
-                print(f"Error response: {json.dumps(error_data, indent=2)}")
-            except:
-                print(f"Error response text: {response.text}")
-            return None
-            
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request: {e}")
-        if hasattr(e, 'response') and e.response:
-            print(f"Response status code: {e.response.status_code}")
-            try:
-                error_data = e.response.json()
-                print(f"Error response: {json.dumps(error_data, indent=2)}")
-            except:
-                print(f"Error response text: {e.response.text}")
-        return None
+    Returns:
+        list: API responses in the same order as requests_list (None for failures)
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda request: make_request(api_key, api_secret, *request),
+            requests_list
+        ))
+
+async def make_requests_async(api_key, api_secret, requests_list):
+    """Async counterpart of make_requests_parallel using asyncio.gather.
+    
+    Args:
+        api_key: API key
+        api_secret: API secret
+        requests_list: Sequence of (method, endpoint[, params[, data]]) tuples
+        
+    Returns:
+        list: API responses in the same order as requests_list (None for failures)
+    """
+    return await asyncio.gather(
+        *(make_request_async(api_key, api_secret, *request) for request in requests_list)
+    )
+
+def close_session():
+    """Close the pooled connections held by the shared HTTP session."""
+    _session.close()
 
 def get_api_credentials():
     """Get API credentials from environment variables.
@@ -138,7 +468,7 @@ def get_api_credentials():
     api_secret = os.environ.get('RIPIO_API_SECRET')
     
     if not api_key or not api_secret:
-        print("Error: RIPIO_API_KEY and RIPIO_API_SECRET environment variables must be set")
+        logger.error("Error: RIPIO_API_KEY and RIPIO_API_SECRET environment variables must be set")
         return None, None
     
     return api_key, api_secret